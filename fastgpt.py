@@ -1,10 +1,171 @@
 import requests
+import contextlib
+import gzip
 import json
 import os
+import re
+import shutil
+import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Union, Type, TypeVar
+from typing import List, Dict, Optional, Any, Tuple, Union, Type, TypeVar
 from urllib.parse import quote, urlparse, unquote
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec 为可选依赖，仅用于 search_test 结果的快速解码
+    msgspec = None
+
+# 下载/上传时的分块大小 (1MB)
+_CHUNK_SIZE = 1 << 20
+
+# 允许上传的文件扩展名
+_ALLOWED_EXT = frozenset({'pdf', 'xlsx', 'pptx', 'docx', 'md', 'txt'})
+_ALLOWED_EXT_HINT = ', '.join(sorted(_ALLOWED_EXT))
+
+# get_dataset_detail 本地缓存的最大条目数
+_DETAIL_CACHE_MAXSIZE = 128
+
+# quote(safe='') 不会改变的字符集合，文件名全由这些字符组成时无需编码
+_URL_SAFE_FILENAME = re.compile(r'[A-Za-z0-9._~-]+')
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节串 (优先使用 orjson)"""
+    if orjson is not None:
+        # 与标准库一致，允许 int 等非 str 类型的字典键 (如用户传入的 metadata)
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析 JSON 字节串 (优先使用 orjson)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _check_file_ext(filename: str) -> str:
+    """校验文件扩展名，返回小写扩展名；不支持的格式抛出 ValueError"""
+    _, sep, ext = filename.rpartition('.')
+    ext = ext.lower() if sep else ''
+    if ext not in _ALLOWED_EXT:
+        raise ValueError(f"不支持的文件格式: {ext}. 仅允许以下格式: {_ALLOWED_EXT_HINT}")
+    return ext
+
+
+def _encode_filename(filename: str) -> str:
+    """对文件名进行 URL 编码 (中文等非 ASCII 字符)；纯安全字符的文件名原样返回"""
+    if _URL_SAFE_FILENAME.fullmatch(filename):
+        return filename
+    return quote(filename, safe='')
+
+
+def _open_upload_file(file_path: str) -> Any:
+    """
+    打开待上传的本地文件
+    HTTP 层按 8~64KB 小块读取请求体，1MB 读缓冲将多次 read 系统调用合并为一次；
+    POSIX 平台上同时提示内核顺序读取以加大预读窗口
+    """
+    f = open(file_path, 'rb', buffering=_CHUNK_SIZE)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+
+def _build_chunk_payload(
+    *,
+    training_type: str,
+    chunk_setting_mode: str,
+    chunk_split_mode: str,
+    chunk_size: int,
+    index_size: int,
+    chunk_splitter: str,
+    qa_prompt: str,
+    index_prefix_title: Optional[bool],
+    auto_indexes: Optional[bool],
+    image_index: Optional[bool],
+    tags: Optional[List[str]],
+    create_time: Optional[str]
+) -> Dict:
+    """构造文本/链接/文件集合共用的分块与训练参数 (仅包含实际生效的字段)"""
+    payload = {}
+    # 仅在 custom 模式下添加分块参数
+    if chunk_setting_mode == "custom":
+        payload["chunkSplitMode"] = chunk_split_mode
+        payload["chunkSize"] = chunk_size
+        payload["indexSize"] = index_size
+        if chunk_splitter:
+            payload["chunkSplitter"] = chunk_splitter
+    
+    if training_type == "qa" and qa_prompt:
+        payload["qaPrompt"] = qa_prompt
+    if index_prefix_title is not None:
+        payload["indexPrefixTitle"] = index_prefix_title
+    if auto_indexes is not None:
+        payload["autoIndexes"] = auto_indexes
+    if image_index is not None:
+        payload["imageIndex"] = image_index
+    if tags:
+        payload["tags"] = tags
+    if create_time:
+        payload["createTime"] = create_time
+    return payload
+
+
+class _ResponseBody:
+    """将流式下载的响应体包装为已知长度的文件对象，供 MultipartEncoder 边下载边上传"""
+
+    def __init__(self, raw: Any, length: int):
+        self._raw = raw
+        self.len = length  # 剩余未读字节数，MultipartEncoder 依此计算 Content-Length
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(self.len if size is None or size < 0 else min(size, self.len))
+        if not chunk and self.len:
+            raise IOError(f"源文件下载中断，剩余 {self.len} 字节未读取")
+        self.len -= len(chunk)
+        return chunk
+
+
+class _RetryPolicy(Retry):
+    """
+    适配器层重试策略
+    GET / DELETE 为幂等请求，按完整策略重试 (连接失败、读失败、status_forcelist 中的状态码)；
+    POST 非幂等 (重复执行会创建重复的知识库 / 集合 / 数据)，仅在请求确定未被服务端处理时重试：
+    连接建立失败，或带 Retry-After 的 429 / 503
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == 'POST':
+            return bool(
+                self.total
+                and self._is_method_retryable(method)
+                and has_retry_after
+                and status_code in (429, 503)
+            )
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(self, method: Optional[str] = None, url: Optional[str] = None, *args, **kwargs) -> Retry:
+        if method and method.upper() == 'POST':
+            # 读超时 / 连接中断时请求可能已被服务端处理：read=False 直接抛出原错误，other=0 不再重试
+            return super(_RetryPolicy, self.new(read=False, other=0)).increment(method, url, *args, **kwargs)
+        return super().increment(method, url, *args, **kwargs)
 
 # ==========================================
 # 1. 响应数据模型封装 (Data Models)
@@ -12,7 +173,10 @@ from urllib.parse import quote, urlparse, unquote
 
 T = TypeVar('T')
 
-@dataclass
+# Python 3.10+ 的 dataclass 支持 slots=True，去掉实例 __dict__；旧版本退化为普通 dataclass
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class BaseResponse:
     """API 基础响应结构"""
     code: int           # 状态码 (200 为成功)
@@ -24,7 +188,7 @@ class BaseResponse:
     def is_success(self) -> bool:
         return 200 <= self.code < 300
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ModelConfig:
     """模型配置信息"""
     model: str                  # 模型具体名称 (如 text-embedding-ada-002)
@@ -32,7 +196,7 @@ class ModelConfig:
     charsPointsPrice: float     # 价格 (每千 token 或积分)
     defaultToken: int           # 默认最大 Token 数
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class DatasetDetail:
     """知识库详情对象"""
     id: str                     # 知识库 ID (_id)
@@ -66,7 +230,7 @@ class DatasetDetail:
             isOwner=data.get('isOwner', False)
         )
 
-@dataclass
+@dataclass(**_SLOTS)
 class PushResults:
     """数据导入结果统计"""
     insertLen: int              # 成功插入的数据条数
@@ -74,65 +238,133 @@ class PushResults:
     repeat: List[Any] = field(default_factory=list)     # 重复的数据 (未入库)
     error: List[Any] = field(default_factory=list)      # 处理发生错误的数据
 
-@dataclass
+@dataclass(**_SLOTS)
 class CollectionCreateResult:
     """创建集合 (文本/链接/文件) 的返回结果"""
     collectionId: str           # 创建成功的集合 ID
     insertLen: int = 0          # 插入的块数量
 
-@dataclass
+@dataclass(**_SLOTS)
 class SearchResultItem:
-    """单条搜索结果"""
-    id: str                     # 数据 ID
-    q: str                      # 问题 / 索引内容
-    a: str                      # 答案 / 详细内容
-    datasetId: str              # 所属知识库 ID
-    collectionId: str           # 所属集合 ID
-    sourceName: str             # 来源名称 (文件名/网页标题)
-    sourceId: Optional[str]     # 来源 ID
-    score: float                # 匹配分数 (相似度)
-
-@dataclass
+    """单条搜索结果 (字段缺省值与接口缺省一致，msgspec 可直接解码)"""
+    id: str = ''                        # 数据 ID
+    q: str = ''                         # 问题 / 索引内容
+    a: str = ''                         # 答案 / 详细内容
+    datasetId: str = ''                 # 所属知识库 ID
+    collectionId: str = ''              # 所属集合 ID
+    sourceName: str = ''                # 来源名称 (文件名/网页标题)
+    sourceId: Optional[str] = None      # 来源 ID
+    # 匹配分数：旧版接口为相似度数值，新版为 [{"type": ..., "value": ..., "index": ...}] 列表
+    score: Union[float, List[Dict[str, Any]]] = 0.0
+
+@dataclass(**_SLOTS)
 class SearchTestResult:
     """搜索测试返回列表"""
     list: List[SearchResultItem]
 
     @classmethod
     def from_list(cls, data_list: List[Dict]) -> 'SearchTestResult':
-        items = [
-            SearchResultItem(
-                id=item.get('id', ''),
-                q=item.get('q', ''),
-                a=item.get('a', ''),
-                datasetId=item.get('datasetId', ''),
-                collectionId=item.get('collectionId', ''),
-                sourceName=item.get('sourceName', ''),
-                sourceId=item.get('sourceId'),
-                score=item.get('score', 0.0)
-            ) for item in data_list
-        ]
-        return cls(list=items)
+        if not data_list:
+            return cls(list=[])
+        # 逐行取出字段后转置为 8 列，再由 map 按位置批量构造
+        columns = zip(*(
+            (d.get('id', ''), d.get('q', ''), d.get('a', ''), d.get('datasetId', ''),
+             d.get('collectionId', ''), d.get('sourceName', ''), d.get('sourceId'),
+             d.get('score', 0.0))
+            for d in data_list
+        ))
+        return cls(list=list(map(SearchResultItem, *columns)))
+
+if msgspec is not None:
+    class _SearchTestData(msgspec.Struct):
+        list: List[SearchResultItem]
+
+    class _SearchTestEnvelope(msgspec.Struct):
+        """searchTest 响应外层结构，仅声明快速路径需要的字段"""
+        code: int = 200
+        data: Optional[_SearchTestData] = None
+
+    # 直接将响应字节解码为 SearchResultItem 列表，跳过中间 dict
+    _SEARCH_TEST_DECODER = msgspec.json.Decoder(_SearchTestEnvelope)
+else:
+    _SEARCH_TEST_DECODER = None
 
 # ==========================================
 # 2. 核心客户端类 (Client)
 # ==========================================
 
 class FastGPTKnowledgeBase:
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_maxsize: int = 32,
+        detail_cache_ttl: float = 60,
+        compress_threshold: Optional[int] = None
+    ):
         """
         初始化客户端
         :param base_url: API 基础地址 (如 http://localhost:3000/api)
         :param api_key: FastGPT API Key
+        :param pool_maxsize: 每个主机的最大保活连接数，应不小于并发请求数
+        :param detail_cache_ttl: 知识库详情的本地缓存时间 (秒)，0 表示不缓存
+        :param compress_threshold: JSON 请求体超过该字节数时以 gzip 压缩发送 (如 16384)；
+                                   默认 None 不压缩，需确认服务端支持 Content-Encoding: gzip
         """
         self.base_url = base_url.rstrip('/')
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        # 大请求体 gzip 压缩
+        self._compress_threshold = compress_threshold
+        self._gzip_headers = {**self.headers, "Content-Encoding": "gzip"}
+        # multipart 上传的鉴权头；Content-Type (含每次随机生成的 boundary) 由 MultipartEncoder 提供
+        self._multipart_headers = {"Authorization": f"Bearer {api_key}"}
+        # 知识库详情缓存：{dataset_id: (过期时间, DatasetDetail)}
+        self._detail_cache: Dict[str, Tuple[float, DatasetDetail]] = {}
+        self._detail_cache_ttl = detail_cache_ttl
+        self._detail_cache_lock = threading.Lock()
+        # 复用连接池：同一 base_url 的连续请求无需重复建立 TCP/TLS 连接
+        # 注意：鉴权头按请求传入，不挂在 Session 上，避免下载第三方 URL 时泄露 API Key
+        self._session = requests.Session()
+        # 瞬时错误在适配器层指数退避重试，重试时复用已建立的连接；POST 的重试范围见 _RetryPolicy
+        retry = _RetryPolicy(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST', 'DELETE']),
+            raise_on_status=False,
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        # 文件上传的请求体是一次性读取的流，无法重放，为上传接口单独挂载不重试的适配器
+        self._session.mount(
+            f"{self.base_url}/core/dataset/collection/create/localFile",
+            HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        )
+
+    def close(self) -> None:
+        """关闭客户端，释放连接池"""
+        self._session.close()
+
+    def __enter__(self) -> 'FastGPTKnowledgeBase':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
     def _post(self, endpoint: str, json_data: Dict = None, **kwargs) -> Dict:
         """内部 POST 请求"""
-        return self._request("POST", endpoint, json=json_data, **kwargs)
+        # 直接传入序列化后的字节，绕过 requests 默认的 json 编码 (Content-Type 已在 headers 中)
+        body = _json_dumps(json_data) if json_data is not None else None
+        if body is not None and self._compress_threshold is not None and len(body) > self._compress_threshold:
+            # 文本类大请求体 (push_data / create_text_collection) 压缩后通常只有原大小的 1/3~1/10
+            body = gzip.compress(body, compresslevel=4)
+            kwargs["headers"] = self._gzip_headers
+        return self._request("POST", endpoint, data=body, **kwargs)
 
     def _get(self, endpoint: str, params: Dict = None) -> Dict:
         """内部 GET 请求"""
@@ -143,19 +375,31 @@ class FastGPTKnowledgeBase:
         return self._request("DELETE", endpoint, params=params)
 
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict:
+        return self._parse_response(self._request_content(method, endpoint, **kwargs))
+
+    def _request_content(self, method: str, endpoint: str, **kwargs) -> bytes:
+        """发送请求，返回未解析的响应体"""
         url = f"{self.base_url}{endpoint}"
-        try:
-            response = requests.request(method, url, headers=self.headers, **kwargs)
-            response.raise_for_status()
-            res_json = response.json()
-            
-            # 基础错误拦截
-            if res_json.get('code') and res_json['code'] not in [200, 201]:
-                raise Exception(f"FastGPT API Error: {res_json.get('message')}")
-            
-            return res_json
-        except Exception as e:
-            raise Exception(f"Request Failed: {str(e)}")
+        headers = kwargs.pop("headers", self.headers)
+        response = self._session.request(method, url, headers=headers, **kwargs)
+        if not response.ok:
+            # 错误信息只截取响应体前 256 字节
+            detail = response.content[:256].decode('utf-8', errors='replace')
+            raise requests.HTTPError(
+                f"{response.status_code} {response.reason} for {method} {endpoint}: {detail}",
+                response=response
+            )
+        return response.content
+
+    @staticmethod
+    def _parse_response(content: bytes) -> Dict:
+        res_json = _json_loads(content)
+        
+        # 基础错误拦截
+        if res_json.get('code') and res_json['code'] not in [200, 201]:
+            raise Exception(f"FastGPT API Error: {res_json.get('message')}")
+        
+        return res_json
 
     # ---------------------- 知识库管理 ----------------------
 
@@ -189,11 +433,28 @@ class FastGPTKnowledgeBase:
 
     def get_dataset_detail(self, dataset_id: str) -> DatasetDetail:
         """
-        获取知识库详情
-        :return: DatasetDetail 对象
+        获取知识库详情 (结果在本地缓存 detail_cache_ttl 秒)
+        :return: DatasetDetail 对象 (只读，缓存命中时各调用方共享同一实例)
         """
+        cached = self._detail_cache.get(dataset_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
         res = self._get("/core/dataset/detail", params={"id": dataset_id})
-        return DatasetDetail.from_dict(res['data'])
+        detail = DatasetDetail.from_dict(res['data'])
+        if self._detail_cache_ttl > 0:
+            with self._detail_cache_lock:
+                self._detail_cache.pop(dataset_id, None)
+                if len(self._detail_cache) >= _DETAIL_CACHE_MAXSIZE:
+                    # 淘汰最早写入的条目
+                    self._detail_cache.pop(next(iter(self._detail_cache)))
+                self._detail_cache[dataset_id] = (time.monotonic() + self._detail_cache_ttl, detail)
+        return detail
+
+    def invalidate_dataset(self, dataset_id: str) -> None:
+        """清除指定知识库详情的本地缓存 (在其他途径修改知识库后调用)"""
+        with self._detail_cache_lock:
+            self._detail_cache.pop(dataset_id, None)
 
     def delete_dataset(self, dataset_id: str) -> bool:
         """
@@ -201,6 +462,7 @@ class FastGPTKnowledgeBase:
         :return: 是否成功
         """
         self._delete("/core/dataset/delete", params={"id": dataset_id})
+        self.invalidate_dataset(dataset_id)
         return True
 
     # ---------------------- 集合(数据源)管理 ----------------------
@@ -265,30 +527,22 @@ class FastGPTKnowledgeBase:
             "trainingType": training_type,
             "customPdfParse": custom_pdf_parse,
             "chunkSettingMode": chunk_setting_mode,
-            "metadata": metadata or {}
+            "metadata": metadata or {},
+            **_build_chunk_payload(
+                training_type=training_type,
+                chunk_setting_mode=chunk_setting_mode,
+                chunk_split_mode=chunk_split_mode,
+                chunk_size=chunk_size,
+                index_size=index_size,
+                chunk_splitter=chunk_splitter,
+                qa_prompt=qa_prompt,
+                index_prefix_title=index_prefix_title,
+                auto_indexes=auto_indexes,
+                image_index=image_index,
+                tags=tags,
+                create_time=create_time
+            )
         }
-        
-        # 仅在 custom 模式下添加分块参数
-        if chunk_setting_mode == "custom":
-            payload["chunkSplitMode"] = chunk_split_mode
-            payload["chunkSize"] = chunk_size
-            payload["indexSize"] = index_size
-            if chunk_splitter:
-                payload["chunkSplitter"] = chunk_splitter
-        
-        if training_type == "qa" and qa_prompt:
-            payload["qaPrompt"] = qa_prompt
-        if index_prefix_title is not None:
-            payload["indexPrefixTitle"] = index_prefix_title
-        if auto_indexes is not None:
-            payload["autoIndexes"] = auto_indexes
-        if image_index is not None:
-            payload["imageIndex"] = image_index
-        if tags:
-            payload["tags"] = tags
-        if create_time:
-            payload["createTime"] = create_time
-            
         res = self._post("/core/dataset/collection/create/text", json_data=payload)
         # API 返回的 data 直接是 collectionId 字符串
         return res['data']
@@ -325,30 +579,22 @@ class FastGPTKnowledgeBase:
             "trainingType": training_type,
             "customPdfParse": custom_pdf_parse,
             "chunkSettingMode": chunk_setting_mode,
-            "metadata": metadata or {"webPageSelector": selector}
+            "metadata": metadata or {"webPageSelector": selector},
+            **_build_chunk_payload(
+                training_type=training_type,
+                chunk_setting_mode=chunk_setting_mode,
+                chunk_split_mode=chunk_split_mode,
+                chunk_size=chunk_size,
+                index_size=index_size,
+                chunk_splitter=chunk_splitter,
+                qa_prompt=qa_prompt,
+                index_prefix_title=index_prefix_title,
+                auto_indexes=auto_indexes,
+                image_index=image_index,
+                tags=tags,
+                create_time=create_time
+            )
         }
-        
-        # 仅在 custom 模式下添加分块参数
-        if chunk_setting_mode == "custom":
-            payload["chunkSplitMode"] = chunk_split_mode
-            payload["chunkSize"] = chunk_size
-            payload["indexSize"] = index_size
-            if chunk_splitter:
-                payload["chunkSplitter"] = chunk_splitter
-        
-        if training_type == "qa" and qa_prompt:
-            payload["qaPrompt"] = qa_prompt
-        if index_prefix_title is not None:
-            payload["indexPrefixTitle"] = index_prefix_title
-        if auto_indexes is not None:
-            payload["autoIndexes"] = auto_indexes
-        if image_index is not None:
-            payload["imageIndex"] = image_index
-        if tags:
-            payload["tags"] = tags
-        if create_time:
-            payload["createTime"] = create_time
-            
         res = self._post("/core/dataset/collection/create/link", json_data=payload)
         # API 返回的 data 直接是 collectionId 字符串
         return res['data']
@@ -357,7 +603,7 @@ class FastGPTKnowledgeBase:
     def create_file_collection(
         self,
         dataset_id: str,
-        file_path: str,  # 支持本地文件路径或URL链接
+        file_path: Union[str, os.PathLike],  # 支持本地文件路径 (str / Path) 或URL链接
         training_type: str = "chunk",  # chunk 或 qa
         name: Optional[str] = None,
         parent_id: Optional[str] = None,
@@ -382,116 +628,119 @@ class FastGPTKnowledgeBase:
         :param file_path: 本地文件路径或URL链接
         :return: 集合 ID (collectionId)
         """
-        # 允许的文件扩展名
-        ALLOWED_EXTENSIONS = {'pdf', 'xlsx', 'pptx', 'docx', 'md', 'txt'}
+        # 统一为 str (兼容 pathlib.Path)，并判断是否为URL
+        file_path = os.fspath(file_path)
+        is_url = file_path.startswith(('http://', 'https://'))
         
-        # 判断是否为URL
-        is_url = file_path.startswith('http://') or file_path.startswith('https://')
-        temp_file_path = None
+        if is_url:
+            # 从URL获取文件名
+            parsed_url = urlparse(file_path)
+            filename = os.path.basename(unquote(parsed_url.path))
+        else:
+            # 本地文件路径
+            try:
+                os.stat(file_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"文件不存在: {file_path}") from None
+            filename = os.path.basename(file_path)
         
+        # 验证文件扩展名 (参数错误直接抛出 ValueError，不包装为上传失败)
+        _check_file_ext(filename)
+        
+        # 对中文文件名进行 URL 编码
+        encoded_filename = _encode_filename(name or filename)
+        
+        # 构造元数据
+        form_metadata = {
+            "datasetId": dataset_id,
+            "parentId": parent_id,
+            "trainingType": training_type,
+            "customPdfParse": custom_pdf_parse,
+            "chunkSettingMode": chunk_setting_mode,
+            "metadata": metadata or {},
+            **_build_chunk_payload(
+                training_type=training_type,
+                chunk_setting_mode=chunk_setting_mode,
+                chunk_split_mode=chunk_split_mode,
+                chunk_size=chunk_size,
+                index_size=index_size,
+                chunk_splitter=chunk_splitter,
+                qa_prompt=qa_prompt,
+                index_prefix_title=index_prefix_title,
+                auto_indexes=auto_indexes,
+                image_index=image_index,
+                tags=tags,
+                create_time=create_time
+            )
+        }
+        
+        # 上传文件
+        url = f"{self.base_url}/core/dataset/collection/create/localFile"
         try:
-            if is_url:
-                # 从URL获取文件名
-                parsed_url = urlparse(file_path)
-                url_filename = os.path.basename(unquote(parsed_url.path))
+            with contextlib.ExitStack() as stack:
+                if is_url:
+                    # 流式下载：响应体直接作为 multipart 文件部分转发，不经过磁盘
+                    source = stack.enter_context(self._session.get(file_path, stream=True, timeout=30))
+                    source.raise_for_status()
+                    content_length = source.headers.get('Content-Length', '')
+                    if content_length.isdigit() and source.headers.get('Content-Encoding', 'identity') == 'identity':
+                        f = _ResponseBody(source.raw, int(content_length))
+                    else:
+                        # 源站未给出确切长度 (chunked 或压缩传输)，先写入临时文件以确定 Content-Length
+                        source.raw.decode_content = True
+                        f = stack.enter_context(tempfile.TemporaryFile())
+                        shutil.copyfileobj(source.raw, f, length=_CHUNK_SIZE)
+                        f.seek(0)
+                else:
+                    f = stack.enter_context(_open_upload_file(file_path))
                 
-                # 验证文件扩展名
-                file_ext = url_filename.split('.')[-1].lower() if '.' in url_filename else ''
-                if file_ext not in ALLOWED_EXTENSIONS:
-                    raise ValueError(
-                        f"不支持的文件格式: {file_ext}. "
-                        f"仅允许以下格式: {', '.join(ALLOWED_EXTENSIONS)}"
-                    )
+                # 使用编码后的文件名；MultipartEncoder 按需分块读取文件，不在内存中拼装整个请求体
+                encoder = MultipartEncoder(fields={
+                    'data': _json_dumps(form_metadata),
+                    'file': (encoded_filename, f)
+                })
                 
-                # 下载文件到临时目录
-                response = requests.get(file_path, timeout=30)
+                headers = {**self._multipart_headers, "Content-Type": encoder.content_type}
+                response = self._session.post(url, headers=headers, data=encoder)
                 response.raise_for_status()
-                
-                # 创建临时文件
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_ext}') as tmp_file:
-                    tmp_file.write(response.content)
-                    temp_file_path = tmp_file.name
-                
-                actual_file_path = temp_file_path
-                filename = url_filename
-            else:
-                # 本地文件路径
-                if not os.path.exists(file_path):
-                    raise FileNotFoundError(f"文件不存在: {file_path}")
-                
-                filename = os.path.basename(file_path)
-                
-                # 验证文件扩展名
-                file_ext = filename.split('.')[-1].lower() if '.' in filename else ''
-                if file_ext not in ALLOWED_EXTENSIONS:
-                    raise ValueError(
-                        f"不支持的文件格式: {file_ext}. "
-                        f"仅允许以下格式: {', '.join(ALLOWED_EXTENSIONS)}"
-                    )
-                
-                actual_file_path = file_path
-            
-            # 对中文文件名进行 URL 编码
-            encoded_filename = quote(name if name else filename, safe='')
-            
-            # 构造元数据
-            form_metadata = {
-                "datasetId": dataset_id,
-                "parentId": parent_id,
-                "trainingType": training_type,
-                "customPdfParse": custom_pdf_parse,
-                "chunkSettingMode": chunk_setting_mode,
-                "metadata": metadata or {}
-            }
-            
-            # 仅在 custom 模式下添加分块参数
-            if chunk_setting_mode == "custom":
-                form_metadata["chunkSplitMode"] = chunk_split_mode
-                form_metadata["chunkSize"] = chunk_size
-                form_metadata["indexSize"] = index_size
-                if chunk_splitter:
-                    form_metadata["chunkSplitter"] = chunk_splitter
-            
-            if training_type == "qa" and qa_prompt:
-                form_metadata["qaPrompt"] = qa_prompt
-            if index_prefix_title is not None:
-                form_metadata["indexPrefixTitle"] = index_prefix_title
-            if auto_indexes is not None:
-                form_metadata["autoIndexes"] = auto_indexes
-            if image_index is not None:
-                form_metadata["imageIndex"] = image_index
-            if tags:
-                form_metadata["tags"] = tags
-            if create_time:
-                form_metadata["createTime"] = create_time
-            
-            # 上传文件
-            url = f"{self.base_url}/core/dataset/collection/create/localFile"
-            with open(actual_file_path, 'rb') as f:
-                # 使用编码后的文件名
-                files = {'file': (encoded_filename, f)}
-                data = {'data': json.dumps(form_metadata)}
-                
-                # 特殊处理：Header 中去掉 Content-Type，让 requests 自动生成 boundary
-                headers_copy = self.headers.copy()
-                headers_copy.pop("Content-Type", None)
-                
-                response = requests.post(url, headers=headers_copy, files=files, data=data)
-                response.raise_for_status()
-                res_json = response.json()
-                try:
-                    return res_json['data']['collectionId']
-                except:
-                    return res_json['data']
-        except Exception as e:
-            raise Exception(f"File Upload Failed: {str(e)}")
-        finally:
-            # 清理临时文件
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
+                res_json = _json_loads(response.content)
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError, ValueError) as e:
+            # 仅包装网络、IO 与响应解析错误，编程错误原样抛出
+            raise Exception(f"File Upload Failed: {str(e)}") from e
+        
+        # 新版接口返回 {"collectionId": ...}，旧版直接返回 collectionId 字符串
+        data = res_json['data']
+        return data['collectionId'] if isinstance(data, dict) and 'collectionId' in data else data
+
+    def create_file_collections(
+        self,
+        dataset_id: str,
+        file_paths: List[Union[str, os.PathLike]],
+        max_concurrent: int = 6,
+        **kwargs
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        批量并发导入文件，共享同一连接池
+        单个文件失败不会中断其他上传，也不会抛出异常：失败项在返回值中对应异常对象，
+        调用方应逐项检查，只重试失败的文件 (创建集合不是幂等操作，整批重试会产生重复集合)
+        :param file_paths: 本地文件路径或URL链接列表，重复路径只上传一次
+        :param max_concurrent: 最大并发上传数 (不应超过 pool_maxsize，否则多出的线程无法复用连接)
+        :param kwargs: 透传给 create_file_collection 的其余参数
+        :return: {file_path (str): 集合 ID (collectionId) 或该文件上传失败的异常}，按输入顺序排列
+        """
+        # 去重 (Path 与 str 形式的同一路径视为相同)，保持输入顺序
+        unique_paths = list(dict.fromkeys(os.fspath(path) for path in file_paths))
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+            futures = [
+                executor.submit(self.create_file_collection, dataset_id, path, **kwargs)
+                for path in unique_paths
+            ]
+        
+        results: Dict[str, Union[str, Exception]] = {}
+        for path, future in zip(unique_paths, futures):
+            exc = future.exception()
+            results[path] = exc if exc is not None else future.result()
+        return results
 
     # ---------------------- 数据追加 ----------------------
 
@@ -534,6 +783,15 @@ class FastGPTKnowledgeBase:
             "usingReRank": using_re_rank,
             "searchMode": "embedding"
         }
-        res = self._post("/core/dataset/searchTest", json_data=payload)
+        content = self._request_content("POST", "/core/dataset/searchTest", data=_json_dumps(payload))
+        if _SEARCH_TEST_DECODER is not None:
+            try:
+                envelope = _SEARCH_TEST_DECODER.decode(content)
+            except msgspec.DecodeError:
+                # 响应结构与模型不符时回退到通用解析 (由其给出与原先一致的错误)
+                envelope = None
+            if envelope is not None and envelope.data is not None and envelope.code in (200, 201):
+                return envelope.data.list
+        res = self._parse_response(content)
         # 结果是列表
         return SearchTestResult.from_list(res['data']['list']).list
\ No newline at end of file
@@ -0,0 +1,205 @@
+import asyncio
+import os
+from typing import List, Dict, Optional, Any, Union
+from urllib.parse import urlparse, unquote
+
+import aiohttp
+
+from fastgpt import (
+    _CHUNK_SIZE, _build_chunk_payload, _check_file_ext, _encode_filename, _json_dumps, _json_loads,
+    _open_upload_file
+)
+
+# 获取连接的超时 (秒)，包含在连接池中排队等待空闲连接的时间
+_CONNECT_TIMEOUT = 60
+
+# ==========================================
+# 异步客户端 (Async Client)
+# ==========================================
+
+class AsyncFastGPTKnowledgeBase:
+    def __init__(self, base_url: str, api_key: str, pool_maxsize: int = 32):
+        """
+        初始化异步客户端 (基于 aiohttp)
+        :param base_url: API 基础地址 (如 http://localhost:3000/api)
+        :param api_key: FastGPT API Key
+        :param pool_maxsize: 连接池最大连接数，应不小于并发请求数 (URL 来源的下载另用一个同样大小的连接池)
+        """
+        self.base_url = base_url.rstrip('/')
+        # multipart 上传的 Content-Type (含 boundary) 由 MultipartWriter 生成，只需鉴权头
+        self._multipart_headers = {"Authorization": f"Bearer {api_key}"}
+        # aiohttp 的 Session 需在事件循环内创建，首次请求时再初始化
+        self._pool_maxsize = pool_maxsize
+        self._http: Optional[aiohttp.ClientSession] = None
+        # URL 来源的下载单独使用一个 Session：边下边传时每个上传同时占用一条下载连接和一条上传连接，
+        # 若共用一个连接池，下载连接占满后上传永远拿不到连接，整批上传会卡死
+        self._source_http: Optional[aiohttp.ClientSession] = None
+
+    def _get_http(self) -> aiohttp.ClientSession:
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_maxsize),
+                # 与同步客户端一致，不限制总时长：大文件上传 (或边下边传) 可能远超 aiohttp 默认的 5 分钟
+                # connect 同时限制等待空闲连接的时间，连接池被占满时抛出超时而不是无限等待
+                timeout=aiohttp.ClientTimeout(total=None, connect=_CONNECT_TIMEOUT, sock_connect=30)
+            )
+        return self._http
+
+    def _get_source_http(self) -> aiohttp.ClientSession:
+        if self._source_http is None or self._source_http.closed:
+            self._source_http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_maxsize),
+                timeout=aiohttp.ClientTimeout(total=None, connect=_CONNECT_TIMEOUT, sock_connect=30, sock_read=30)
+            )
+        return self._source_http
+
+    async def close(self) -> None:
+        """关闭客户端，释放连接池"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        if self._source_http is not None:
+            await self._source_http.close()
+            self._source_http = None
+
+    async def __aenter__(self) -> 'AsyncFastGPTKnowledgeBase':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    # ---------------------- 集合(数据源)管理 ----------------------
+
+    async def create_file_collection(
+        self,
+        dataset_id: str,
+        file_path: Union[str, os.PathLike],  # 支持本地文件路径 (str / Path) 或URL链接
+        training_type: str = "chunk",  # chunk 或 qa
+        name: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        index_prefix_title: Optional[bool] = True,
+        custom_pdf_parse: bool = True,
+        auto_indexes: Optional[bool] = None,
+        image_index: Optional[bool] = True,
+        chunk_setting_mode: str = "auto",  # auto 或 custom
+        chunk_split_mode: str = "size",  # size 或 char
+        chunk_size: int = 1500,
+        index_size: int = 512,
+        chunk_splitter: str = "",
+        qa_prompt: str = "",
+        tags: Optional[List[str]] = None,
+        create_time: Optional[str] = None,
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """
+        导入文件 (PDF, Word, MD等)，参数与 FastGPTKnowledgeBase.create_file_collection 一致
+        URL 来源的文件边下载边上传 (chunked 传输)，下载与上传在时间上重叠，不落盘
+        :param file_path: 本地文件路径或URL链接
+        :return: 集合 ID (collectionId)
+        """
+        # 统一为 str (兼容 pathlib.Path)，并判断是否为URL
+        file_path = os.fspath(file_path)
+        is_url = file_path.startswith(('http://', 'https://'))
+
+        if is_url:
+            # 从URL获取文件名
+            filename = os.path.basename(unquote(urlparse(file_path).path))
+        else:
+            # 本地文件路径
+            try:
+                os.stat(file_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"文件不存在: {file_path}") from None
+            filename = os.path.basename(file_path)
+
+        # 验证文件扩展名 (参数错误直接抛出 ValueError，不包装为上传失败)
+        _check_file_ext(filename)
+
+        # 对中文文件名进行 URL 编码
+        encoded_filename = _encode_filename(name or filename)
+
+        # 构造元数据
+        form_metadata = {
+            "datasetId": dataset_id,
+            "parentId": parent_id,
+            "trainingType": training_type,
+            "customPdfParse": custom_pdf_parse,
+            "chunkSettingMode": chunk_setting_mode,
+            "metadata": metadata or {},
+            **_build_chunk_payload(
+                training_type=training_type,
+                chunk_setting_mode=chunk_setting_mode,
+                chunk_split_mode=chunk_split_mode,
+                chunk_size=chunk_size,
+                index_size=index_size,
+                chunk_splitter=chunk_splitter,
+                qa_prompt=qa_prompt,
+                index_prefix_title=index_prefix_title,
+                auto_indexes=auto_indexes,
+                image_index=image_index,
+                tags=tags,
+                create_time=create_time
+            )
+        }
+
+        try:
+            if is_url:
+                # 源站响应体按块直接泵入上传请求，整个文件不会在内存中缓冲
+                async with self._get_source_http().get(file_path) as source:
+                    source.raise_for_status()
+                    return await self._upload(encoded_filename, source.content.iter_chunked(_CHUNK_SIZE), form_metadata)
+            with _open_upload_file(file_path) as f:
+                return await self._upload(encoded_filename, f, form_metadata)
+        except (aiohttp.ClientError, OSError, ValueError) as e:
+            # 仅包装网络、IO 与响应解析错误，编程错误原样抛出
+            raise Exception(f"File Upload Failed: {str(e)}") from e
+
+    async def _upload(self, encoded_filename: str, file_obj: Any, form_metadata: Dict) -> str:
+        """以 multipart/form-data 流式上传文件"""
+        with aiohttp.MultipartWriter('form-data') as writer:
+            # 显式声明 JSON，避免 aiohttp 对 bytes 默认使用 application/octet-stream
+            data_part = writer.append(_json_dumps(form_metadata), {'Content-Type': 'application/json'})
+            data_part.set_content_disposition('form-data', name='data')
+            file_part = writer.append(file_obj)
+            # 文件名已手动编码，不再让 aiohttp 重复转义
+            file_part.set_content_disposition('form-data', quote_fields=False, name='file', filename=encoded_filename)
+
+            url = f"{self.base_url}/core/dataset/collection/create/localFile"
+            async with self._get_http().post(url, headers=self._multipart_headers, data=writer) as response:
+                response.raise_for_status()
+                res_json = _json_loads(await response.read())
+
+        data = res_json['data']
+        return data['collectionId'] if isinstance(data, dict) and 'collectionId' in data else data
+
+    async def create_file_collections(
+        self,
+        dataset_id: str,
+        file_paths: List[Union[str, os.PathLike]],
+        max_concurrent: int = 6,
+        **kwargs
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        批量并发导入文件，返回约定与 FastGPTKnowledgeBase.create_file_collections 一致
+        单个文件失败不会中断其他上传，也不会抛出异常：失败项在返回值中对应异常对象，
+        调用方应逐项检查，只重试失败的文件 (创建集合不是幂等操作，整批重试会产生重复集合)
+        :param file_paths: 本地文件路径或URL链接列表，重复路径只上传一次
+        :param max_concurrent: 最大并发上传数，实际并发不超过 pool_maxsize (URL 来源的下载使用单独的连接池，不占用上传连接)
+        :param kwargs: 透传给 create_file_collection 的其余参数
+        :return: {file_path (str): 集合 ID (collectionId) 或该文件上传失败的异常}，按输入顺序排列
+        """
+        # 去重 (Path 与 str 形式的同一路径视为相同)，保持输入顺序
+        unique_paths = list(dict.fromkeys(os.fspath(path) for path in file_paths))
+        # 并发数不超过连接池大小，避免排队等待连接的上传触发连接超时
+        semaphore = asyncio.Semaphore(min(max_concurrent, self._pool_maxsize))
+
+        async def upload(path: str) -> Union[str, Exception]:
+            async with semaphore:
+                try:
+                    return await self.create_file_collection(dataset_id, path, **kwargs)
+                except Exception as e:
+                    # 失败作为结果返回，不让 gather 提前抛出而丢下仍在上传的其他任务
+                    return e
+
+        results = await asyncio.gather(*(upload(path) for path in unique_paths))
+        return dict(zip(unique_paths, results))